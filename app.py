@@ -8,102 +8,168 @@ import os
 import re
 import io
 import json
+import logging
 import base64
+import csv
+import functools
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from operator import itemgetter
 from datetime import datetime
 
+import numpy as np
 import plotly.graph_objects as go
-from dash import Dash, dcc, html, Input, Output, State, callback_context, no_update, ctx
+from dash import Dash, dcc, html, Input, Output, State, Patch, no_update, ctx
+
+# Debug output goes through logging so the messages are only formatted when
+# enabled (set PRASHNAI_DEBUG=1 when running this file)
+log = logging.getLogger(__name__)
 
 ############################
 # Parsing & Utilities
 ############################
 
-QA_BLOCK_RE = re.compile(r"(?ms)^Q\s*(\d+)\s*:\s*(.*?)\n\s*A\)\s*(.*?)\n\s*B\)\s*(.*?)\n\s*C\)\s*(.*?)\n\s*D\)\s*(.*?)\n\s*Answer\s*:\s*([ABCD])\s*$")
-# Supports lines like: Q1: text (variant x-y) — but we only use the stem; variant is ignored
+QA_BLOCK_RE = re.compile(
+    r"^Q\s*(\d+)\s*:\s*(.*?)(?:\s*\((?i:variant)[^)]*\)[ \t]*)?\n\s*A\)\s*(.*?)\n\s*B\)\s*(.*?)\n\s*C\)\s*(.*?)\n\s*D\)\s*(.*?)\n\s*Answer\s*:\s*([ABCD])\s*$",
+    re.MULTILINE | re.DOTALL | re.ASCII,
+)
+# Supports lines like: Q1: text (variant x-y) — but we only use the stem; a trailing
+# variant tag is matched outside the stem group, so it never reaches the stem text
+
+# Compiled once here so the per-question helpers skip re's cache lookup
+_WS_RE = re.compile(r"\s+")
+_VARIANT_RE = re.compile(r"\(variant[^\)]*\)", re.IGNORECASE)
 
 
 def clean_text(s: str) -> str:
-    return re.sub(r"\s+", " ", s).strip()
+    return _WS_RE.sub(" ", s).strip()
 
 
 def normalize_stem(stem: str) -> str:
-    # Remove parenthetical variant tags and collapse whitespace
-    stem = re.sub(r"\(variant[^\)]*\)", "", stem, flags=re.IGNORECASE)
+    # Remove parenthetical variant tags and collapse whitespace. Most stems have
+    # no parentheses at all, so skip the second regex pass for them
+    if "(" in stem:
+        stem = _VARIANT_RE.sub("", stem)
     return clean_text(stem)
 
 
-def parse_quiz_text(text: str, dedupe=True):
-    """Parse quiz text into a list of question dicts.
-    Expected format blocks like in the user's example.
+_OPTION_PREFIXES = ("A)", "B)", "C)", "D)")
+# Answers and choices are stored as indexes into LETTERS; letters are only used for display
+LETTERS = ("A", "B", "C", "D")
+
+
+def parse_quiz_text_fast(lines):
+    """Scan quiz lines once, yielding (qnum, stem, A, B, C, D, answer) tuples.
+    Follows the same grammar as QA_BLOCK_RE: a 'Qn:' line opens a block, the
+    'A)'..'D)' lines must follow in order and 'Answer: X' closes it. Any other
+    line continues the field currently being filled.
     """
-    blocks = []
-    # Split by blank lines that start a new question Qn:
-    # A stricter approach: find all QA blocks by regex scanning.
-    for match in QA_BLOCK_RE.finditer(text):
-        qnum = match.group(1)
-        stem_raw = match.group(2)
-        A, B, C, D = (match.group(3), match.group(4), match.group(5), match.group(6))
-        ans = match.group(7).upper()
-        stem = normalize_stem(stem_raw)
-        block = {
-            "qnum": int(qnum),
-            "stem": stem,
-            "stem_raw": clean_text(stem_raw),
-            "options": {"A": clean_text(A), "B": clean_text(B), "C": clean_text(C), "D": clean_text(D)},
-            "answer": ans,
-        }
-        blocks.append(block)
-
-    if not blocks:
-        # Try to be forgiving: chunk by 'Q' lines and rescan inside chunks
-        chunks = re.split(r"(?m)^(?=Q\s*\d+\s*:)", text)
-        for ch in chunks:
-            m = QA_BLOCK_RE.search(ch)
-            if m:
-                qnum = m.group(1)
-                stem_raw = m.group(2)
-                A, B, C, D = (m.group(3), m.group(4), m.group(5), m.group(6))
-                ans = m.group(7).upper()
-                stem = normalize_stem(stem_raw)
-                blocks.append({
-                    "qnum": int(qnum),
-                    "stem": stem,
-                    "stem_raw": clean_text(stem_raw),
-                    "options": {"A": clean_text(A), "B": clean_text(B), "C": clean_text(C), "D": clean_text(D)},
-                    "answer": ans,
-                })
-
-    if dedupe:
-        seen = set()
-        deduped = []
-        for b in blocks:
-            key = b["stem"].lower()
+    qnum = None
+    parts = None
+    field = 0
+    for line in lines:
+        if line.startswith("Q"):
+            head, sep, rest = line[1:].partition(":")
+            head = head.strip()
+            if sep and head.isascii() and head.isdecimal():
+                qnum = head
+                parts = ([rest], [], [], [], [])
+                field = 0
+                continue
+        if qnum is None:
+            continue
+        s = line.strip()
+        if field < 4 and s.startswith(_OPTION_PREFIXES[field]):
+            field += 1
+            parts[field].append(s[2:])
+            continue
+        if field == 4 and s.startswith("Answer"):
+            head, sep, rest = s.partition(":")
+            ans = rest.strip()
+            if sep and head.rstrip() == "Answer" and ans in LETTERS:
+                yield (qnum, " ".join(parts[0]), " ".join(parts[1]), " ".join(parts[2]),
+                       " ".join(parts[3]), " ".join(parts[4]), ans)
+                qnum = None
+                continue
+        parts[field].append(s)
+
+
+def _make_row(qnum, stem_raw, A, B, C, D, ans):
+    return (int(qnum), normalize_stem(stem_raw), (clean_text(A), clean_text(B), clean_text(C), clean_text(D)),
+            LETTERS.index(ans.upper()))
+
+
+def _collect_rows(matches, dedupe):
+    """Build question rows from field tuples, dropping repeated stems as they arrive."""
+    rows = []
+    seen = set()
+    for fields in matches:
+        row = _make_row(*fields)
+        if dedupe:
+            key = row[1].casefold()
             if key in seen:
                 continue
             seen.add(key)
-            deduped.append(b)
-        blocks = deduped
+        rows.append(row)
+    return rows
+
+
+def parse_quiz_text(text, dedupe=True):
+    """Parse quiz text into question columns:
+    {"stem": [...], "opts": [[A, B, C, D], ...], "ans": [0-3, ...], "choices": [...]}.
+    Parsed quizzes are stored column-wise so they don't repeat the same keys
+    for every question. "ans" indexes into LETTERS and
+    "choices" holds each question's ready-made RadioItems options.
+    Expected format blocks like in the user's example. `text` may be a str or
+    any iterable of lines (e.g. an open text stream), which is consumed lazily.
+    """
+    lines = text.splitlines() if isinstance(text, str) else text
+    rows = _collect_rows(parse_quiz_text_fast(lines), dedupe)
+
+    if not rows and isinstance(text, str):
+        # Be forgiving: let the block regex have a go at anything the line scan missed
+        rows = _collect_rows((m.groups() for m in QA_BLOCK_RE.finditer(text)), dedupe)
 
     # Sort by qnum for stable order
-    blocks.sort(key=lambda x: x.get("qnum", 0))
-    return blocks
+    rows.sort(key=lambda r: r[0])
+    return {
+        "stem": [r[1] for r in rows],
+        "opts": [r[2] for r in rows],
+        "ans": [r[3] for r in rows],
+        "choices": [
+            [{"label": f"{k}) {opt}", "value": i} for i, (k, opt) in enumerate(zip(LETTERS, r[2]))]
+            for r in rows
+        ],
+    }
+
+
+def num_questions(questions):
+    return len(questions["stem"]) if questions else 0
+
+
+@functools.lru_cache(maxsize=4)
+def _scan_quiz_dir(quiz_dir, mtime_ns):
+    """Sorted (name, path) pairs for the .txt files in quiz_dir.
+    Keyed on the directory's mtime, so adding/removing/renaming a file invalidates it.
+    """
+    with os.scandir(quiz_dir) as entries:
+        return tuple(sorted(
+            (e.name, e.path) for e in entries if e.name.lower().endswith(".txt") and e.is_file()
+        ))
 
 
 def list_quiz_files():
     quiz_dir = os.environ.get("QUIZ_DIR", "")
     items = []
-    print(f"QUIZ_DIR environment variable: {quiz_dir}")
+    log.debug("QUIZ_DIR environment variable: %s", quiz_dir)
     if quiz_dir and os.path.isdir(quiz_dir):
-        files = os.listdir(quiz_dir)
-        print(f"Files found in QUIZ_DIR: {files}")
-        for fn in sorted(files):
-            if fn.lower().endswith(".txt"):
-                full_path = os.path.join(quiz_dir, fn)
-                items.append({"label": fn, "value": full_path})
-                print(f"Added to dropdown: {fn} -> {full_path}")
+        files = _scan_quiz_dir(quiz_dir, os.stat(quiz_dir).st_mtime_ns)
+        items = [{"label": fn, "value": full_path} for fn, full_path in files]
     else:
-        print(f"QUIZ_DIR not found or not a directory: {quiz_dir}")
-    print(f"Dropdown options: {items}")
+        log.warning("QUIZ_DIR not found or not a directory: %s", quiz_dir)
+    log.debug("Dropdown options: %s", items)
     return items
 
 
@@ -232,10 +298,11 @@ app.layout = html.Div([
     ], style={"display": "flex", "gap": "16px"}),
 
     # Hidden stores for state
-    dcc.Store(id="store-questions"),
+    dcc.Store(id="store-questions"),  # key into the server-side _QUIZ_CACHE
     dcc.Store(id="store-order"),
     dcc.Store(id="store-index", data=0),
-    dcc.Store(id="store-history", data=[]),  # list of {idx, chosen, correct(bool)} in order answered
+    # {"items": [{idx, q_idx, chosen, correct(bool)}, ...] in order answered, "correct": running count}
+    dcc.Store(id="store-history", data={"items": [], "correct": 0}),
 ])
 
 ############################
@@ -243,10 +310,91 @@ app.layout = html.Div([
 ############################
 
 
+def new_history():
+    return {"items": [], "correct": 0}
+
+
+# Parsed quizzes stay on the server; the browser's store-questions only holds
+# the key, so callbacks don't ship the whole quiz back and forth as JSON.
+# Keys are derived from the quiz source, so reloading the same content reuses
+# its slot instead of pushing other sessions' quizzes out of the cache
+_QUIZ_CACHE_SIZE = 100
+_QUIZ_CACHE = OrderedDict()
+_QUIZ_CACHE_LOCK = threading.Lock()
+# The built-in sample quiz never leaves memory, so its key is never evicted
+DEFAULT_QUIZ_KEY = "default"
+
+
+def cache_quiz(key, questions):
+    """Store questions under key and return the key."""
+    if key == DEFAULT_QUIZ_KEY:
+        return key
+    with _QUIZ_CACHE_LOCK:
+        _QUIZ_CACHE[key] = questions
+        _QUIZ_CACHE.move_to_end(key)
+        if len(_QUIZ_CACHE) > _QUIZ_CACHE_SIZE:
+            _QUIZ_CACHE.popitem(last=False)
+    return key
+
+
+def get_quiz(key):
+    """Questions for a store-questions key, or None if unknown/evicted."""
+    if key == DEFAULT_QUIZ_KEY:
+        return DEFAULT_QUESTIONS
+    with _QUIZ_CACHE_LOCK:
+        questions = _QUIZ_CACHE.get(key)
+        if questions is not None:
+            _QUIZ_CACHE.move_to_end(key)
+    return questions
+
+
+def upload_digest(contents):
+    """Short hex digest of an upload's data URL, used to key it in the caches."""
+    return hashlib.blake2b(contents.encode(), digest_size=16).hexdigest()
+
+
 def decode_upload(contents):
+    """Return a text stream over the uploaded file; lines are decoded as they are read."""
     content_type, content_string = contents.split(',')
-    decoded = base64.b64decode(content_string)
-    return decoded.decode('utf-8', errors='ignore')
+    return io.TextIOWrapper(io.BytesIO(base64.b64decode(content_string)), encoding='utf-8', errors='ignore')
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_file_cached(path, mtime, dedupe):
+    """Parse a quiz file once per (path, mtime); an edited file gets a new key."""
+    with io.open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return parse_quiz_text(f, dedupe=dedupe)
+
+
+# Parsed uploads keyed by (upload_digest, dedupe). Keying on the digest rather
+# than the data URL itself means the cache never pins whole base64 payloads
+_UPLOAD_CACHE_SIZE = 4
+_UPLOAD_CACHE = OrderedDict()
+_UPLOAD_CACHE_LOCK = threading.Lock()
+
+
+def _parse_upload_cached(contents, digest, dedupe):
+    """Parse an upload once per (digest, dedupe); digest is upload_digest(contents)."""
+    key = (digest, dedupe)
+    with _UPLOAD_CACHE_LOCK:
+        q = _UPLOAD_CACHE.get(key)
+        if q is not None:
+            _UPLOAD_CACHE.move_to_end(key)
+            return q
+    q = parse_quiz_text(decode_upload(contents), dedupe=dedupe)
+    with _UPLOAD_CACHE_LOCK:
+        _UPLOAD_CACHE[key] = q
+        if len(_UPLOAD_CACHE) > _UPLOAD_CACHE_SIZE:
+            _UPLOAD_CACHE.popitem(last=False)
+    return q
+
+
+@functools.lru_cache(maxsize=32)
+def _shuffled_order(n):
+    """Seeded shuffle of range(n), the same on every load and for every session.
+    A fresh Random(42) per length keeps it independent of other users' loads.
+    """
+    return tuple(random.Random(42).sample(range(n), n))
 
 
 @app.callback(
@@ -266,69 +414,67 @@ def decode_upload(contents):
 )
 
 def load_or_reset(load_clicks, reset_clicks, load_default_clicks, upload_contents, file_path, dedupe_val, shuffle_val):
-    trigger = (callback_context.triggered[0]['prop_id'] if callback_context.triggered else '')
-    print(f"load_or_reset called with trigger: {trigger}")
-    print(f"callback_context.triggered: {callback_context.triggered}")
-    print(f"file_path: {file_path}, upload_contents: {bool(upload_contents)}")
+    trigger = ctx.triggered_id
+    log.debug("load_or_reset called with trigger: %s, file_path: %s, upload: %s", trigger, file_path, bool(upload_contents))
 
-    dedupe = (dedupe_val or []) and ("on" in dedupe_val)
+    dedupe = bool(dedupe_val) and "on" in dedupe_val
     shuffle_opt = (shuffle_val or []) and ("on" in shuffle_val)
 
     # Reset to defaults
-    if 'reset-btn' in trigger or 'load-default-btn' in trigger:
+    if trigger in ("reset-btn", "load-default-btn"):
         q = DEFAULT_QUESTIONS
+        key = DEFAULT_QUIZ_KEY
         status = "Loaded default questions"
     else:
-        text = None
+        q = None
         status = ""
-        if upload_contents and 'upload' in trigger:
+        if upload_contents and trigger == "upload":
             # File was uploaded
             try:
-                text = decode_upload(upload_contents)
+                digest = upload_digest(upload_contents)
+                q = _parse_upload_cached(upload_contents, digest, dedupe)
+                key = f"upload:{int(dedupe)}:{digest}"
                 status = "✅ Successfully loaded uploaded file"
-                print(f"Successfully loaded uploaded file")
+                log.debug("Successfully loaded uploaded file")
             except Exception as e:
                 status = f"❌ Error decoding upload: {e}"
-                print(f"Error decoding upload: {e}")
-                text = None
-        elif file_path and ('file-dropdown' in trigger or 'load-btn' in trigger) and os.path.exists(file_path):
+                log.warning("Error decoding upload: %s", e)
+                q = None
+        elif file_path and trigger in ("file-dropdown", "load-btn") and os.path.exists(file_path):
             # File was selected from dropdown (either directly or via load button)
             try:
-                with io.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
+                mtime = os.path.getmtime(file_path)
+                q = _parse_file_cached(file_path, mtime, dedupe)
+                key = f"file:{int(dedupe)}:{mtime}:{file_path}"
                 status = f"✅ Successfully loaded file: {os.path.basename(file_path)}"
-                print(f"Successfully loaded file: {file_path}")
+                log.debug("Successfully loaded file: %s", file_path)
             except Exception as e:
                 status = f"❌ Error reading file: {e}"
-                print(f"Error reading file {file_path}: {e}")
-                text = None
-        elif 'load-btn' in trigger:
+                log.warning("Error reading file %s: %s", file_path, e)
+                q = None
+        elif trigger == "load-btn":
             # Load button clicked but no file selected - use defaults
-            text = None
             status = "Using default questions (no file selected)"
         else:
             # Initial load or any other case - use defaults
-            text = None
             status = "Using default questions"
         
-        if text:
-            q = parse_quiz_text(text, dedupe=dedupe)
-            status += f" - Parsed {len(q)} questions"
-            print(f"Parsed {len(q)} questions from file")
+        if q is not None:
+            status += f" - Parsed {num_questions(q)} questions"
+            log.debug("Parsed %d questions from file", num_questions(q))
         else:
             q = DEFAULT_QUESTIONS
+            key = DEFAULT_QUIZ_KEY
             if not status:
                 status = "Using default questions"
-            print("Using default questions")
+            log.debug("Using default questions")
 
     # Build order
-    order = list(range(len(q)))
-    if shuffle_opt:
-        import random
-        random.Random(42).shuffle(order)  # deterministic shuffle for reproducibility
+    n = num_questions(q)
+    order = list(_shuffled_order(n)) if shuffle_opt else list(range(n))
 
-    print(f"Returning {len(q)} questions, order length: {len(order)}, status: {status}")
-    return q, order, 0, [], status
+    log.debug("Returning %d questions, order length: %d, status: %s", n, len(order), status)
+    return cache_quiz(key, q), order, 0, new_history(), status
 
 
 @app.callback(
@@ -341,26 +487,21 @@ def load_or_reset(load_clicks, reset_clicks, load_default_clicks, upload_content
     Input("store-index", "data"),
 )
 
-def display_question(questions, order, idx):
-    print(f"display_question called: questions={len(questions) if questions else 0}, order={len(order) if order else 0}, idx={idx}")
+def display_question(quiz_key, order, idx):
+    questions = get_quiz(quiz_key)
+    log.debug("display_question called: idx=%s", idx)
     
-    if not questions:
-        print("No questions loaded - returning default message")
+    if not num_questions(questions):
+        log.debug("No questions loaded - returning default message")
         return "No questions loaded. Please select a file or click 'Load Quiz' to use default questions.", [], None, ""
     if idx >= len(order):
         return "🎉 Quiz Complete! 🎉", [], None, f"Completed {len(order)} of {len(order)} questions"
 
-    q = questions[order[idx]]
-    stem = q["stem"]
-    opts = q["options"]
-    options = [
-        {"label": f"A) {opts['A']}", "value": "A"},
-        {"label": f"B) {opts['B']}", "value": "B"},
-        {"label": f"C) {opts['C']}", "value": "C"},
-        {"label": f"D) {opts['D']}", "value": "D"},
-    ]
+    i = order[idx]
+    stem = questions["stem"][i]
+    options = questions["choices"][i]
     progress = f"Question {idx+1} of {len(order)}"
-    print(f"Displaying question: {stem[:50]}...")
+    log.debug("Displaying question: %.50s...", stem)
     return stem, options, None, progress
 
 
@@ -372,6 +513,7 @@ def display_question(questions, order, idx):
     Input("submit-btn", "n_clicks"),
     Input("next-btn", "n_clicks"),
     Input("reset-btn", "n_clicks"),
+    Input("reveal-btn", "n_clicks"),
     State("store-history", "data"),
     State("store-index", "data"),
     State("store-questions", "data"),
@@ -379,95 +521,73 @@ def display_question(questions, order, idx):
     State("choices", "value"),
     prevent_initial_call=True,
 )
-def main_update(submit_clicks, next_clicks, reset_clicks, history, index, questions, order, chosen):
+def main_update(submit_clicks, next_clicks, reset_clicks, reveal_clicks, history, index, quiz_key, order, chosen):
+    questions = get_quiz(quiz_key)
     trigger = ctx.triggered_id
     if trigger == "submit-btn":
-        if not chosen or not questions or not order or index is None:
-            return "Please select an answer first", {"color": "red"}, history, index
+        if chosen is None or not questions or not order or index is None:
+            return "Please select an answer first", {"color": "red"}, no_update, index
         
-        current_q = questions[order[index]]
-        correct_answer = current_q["answer"]
+        correct_answer = questions["ans"][order[index]]
         is_correct = chosen == correct_answer
         
-        # Add to history
-        new_history = (history or []) + [{
+        # Add to history, keeping the running correct count alongside it
+        history = history or new_history()
+        history["items"].append({
             "idx": index,
             "q_idx": order[index],
             "chosen": chosen,
             "correct": is_correct
-        }]
+        })
+        history["correct"] += int(is_correct)
         
         if is_correct:
-            feedback = f"Correct! The answer is {correct_answer}"
+            feedback = f"Correct! The answer is {LETTERS[correct_answer]}"
             style = {"color": "green"}
         else:
-            feedback = f"Incorrect. The correct answer is {correct_answer}"
+            feedback = f"Incorrect. The correct answer is {LETTERS[correct_answer]}"
             style = {"color": "red"}
         
-        return feedback, style, new_history, index
+        return feedback, style, history, index
     
     elif trigger == "next-btn":
         new_index = (index or 0) + 1
-        return no_update, no_update, history, new_index
+        # Clear the feedback here; history is unchanged, so leave the store alone
+        # and the charts don't re-render
+        return "", {"color": "black"}, no_update, new_index
+    
+    elif trigger == "reveal-btn":
+        if not questions or not order or index is None or index >= len(order):
+            return "No question to reveal", {"color": "gray"}, no_update, no_update
+        
+        i = order[index]
+        correct_answer = questions["ans"][i]
+        feedback = f"The correct answer is {LETTERS[correct_answer]}: {questions['opts'][i][correct_answer]}"
+        return feedback, {"color": "blue", "fontWeight": "bold"}, no_update, no_update
     
     elif trigger == "reset-btn":
-        return "Reset", {"color": "green"}, [], 0
+        return "Reset", {"color": "green"}, new_history(), 0
     
     return no_update, no_update, no_update, no_update
 
-@app.callback(
-    Output("feedback", "children", allow_duplicate=True),
-    Output("feedback", "style", allow_duplicate=True),
-    Input("reveal-btn", "n_clicks"),
-    State("store-questions", "data"),
-    State("store-order", "data"),
-    State("store-index", "data"),
-    prevent_initial_call=True,
-)
-def reveal_answer(reveal_clicks, questions, order, index):
-    if not questions or not order or index is None or index >= len(order):
-        return "No question to reveal", {"color": "gray"}
-    
-    current_q = questions[order[index]]
-    correct_answer = current_q["answer"]
-    feedback = f"The correct answer is {correct_answer}: {current_q['options'][correct_answer]}"
-    style = {"color": "blue", "fontWeight": "bold"}
-    
-    return feedback, style
-
 
 @app.callback(
     Output("file-dropdown", "options"),
     Input("file-dropdown", "id"),
+    Input("load-btn", "n_clicks"),
     prevent_initial_call=False,
 )
-def update_dropdown_options(_):
-    """Update dropdown options when the app loads"""
-    print("Updating dropdown options...")
+def update_dropdown_options(_, __):
+    """Update dropdown options when the app loads and on each Load click.
+    The directory scan is cached on QUIZ_DIR's mtime, so an unchanged folder costs one stat.
+    """
     options = list_quiz_files()
-    print(f"Dropdown updated with {len(options)} options")
+    log.debug("Dropdown updated with %d options", len(options))
     return options
 
-# Also add a callback to refresh dropdown when app starts
-@app.callback(
-    Output("file-dropdown", "options", allow_duplicate=True),
-    Input("load-btn", "n_clicks"),
-    prevent_initial_call=True,
-)
-def refresh_dropdown_on_load(_):
-    """Refresh dropdown when load button is clicked"""
-    print("Refreshing dropdown options...")
-    return list_quiz_files()
 
+_GET_CORRECT = itemgetter("correct")
 
-@app.callback(
-    Output("feedback", "children", allow_duplicate=True),
-    Output("feedback", "style", allow_duplicate=True),
-    Input("next-btn", "n_clicks"),
-    prevent_initial_call=True,
-)
-def clear_feedback_on_next(_):
-    return "", {"color": "black"}
 
 @app.callback(
     Output("score-pie", "figure"),
@@ -477,10 +597,22 @@ def clear_feedback_on_next(_):
 )
 
 def update_charts(history, order):
-    total_answered = len(history or [])
-    correct = sum(1 for h in (history or []) if h["correct"])
+    history = history or new_history()
+    items = history["items"]
+    total_answered = len(items)
+    correct = history["correct"]
     incorrect = total_answered - correct
 
+    # A submit appends exactly one attempt: patch the figures already in the
+    # browser rather than rebuilding and re-sending both of them
+    if ctx.triggered_id == "store-history" and total_answered > 1:
+        pie = Patch()
+        pie["data"][0]["values"] = [correct, incorrect]
+        pie["layout"]["title"]["text"] = f"Score: {correct}/{total_answered}"
+        line = Patch()
+        line["data"][0]["y"].append(100.0 * correct / total_answered)
+        return pie, line
+
     # Pie chart - handle empty state
     if total_answered == 0:
         pie = go.Figure(go.Pie(labels=["No answers yet"], values=[1], hole=0.5))
@@ -500,12 +632,9 @@ def update_charts(history, order):
             annotations=[dict(text="No answers yet", x=0.5, y=0.5, showarrow=False)]
         )
     else:
-        acc_y = []
-        running = 0
-        for i, h in enumerate(history):
-            running += 1 if h["correct"] else 0
-            acc_y.append(100.0 * running / (i + 1))
-        line = go.Figure(go.Scatter(y=acc_y, mode="lines+markers"))
+        correct_arr = np.fromiter(map(_GET_CORRECT, items), dtype=np.int8, count=total_answered)
+        acc_y = 100.0 * np.cumsum(correct_arr) / np.arange(1, total_answered + 1)
+        line = go.Figure(go.Scatter(y=acc_y.tolist(), mode="lines+markers"))
         line.update_layout(margin=dict(l=10, r=10, t=30, b=40), title="Running Accuracy (%)", xaxis_title="Attempt #", yaxis_title="%")
 
     return pie, line
@@ -519,26 +648,25 @@ def update_charts(history, order):
     prevent_initial_call=True,
 )
 
-def download_results(n, history, questions):
-    if not history:
+def download_results(n, history, quiz_key):
+    questions = get_quiz(quiz_key)
+    if not history or not history["items"] or not questions:
         return no_update
-    # Build CSV
-    rows = ["attempt,question,chosen,correct,answer"]
-    for i, h in enumerate(history, start=1):
-        q = questions[h["q_idx"]]
-        rows.append(
-            ",".join([
-                str(i),
-                '"' + q["stem"].replace('"', '""') + '"',
-                h.get("chosen", ""),
-                "TRUE" if h.get("correct") else "FALSE",
-                q.get("answer", ""),
-            ])
-        )
-    csv_str = "\n".join(rows)
+    # Build CSV; csv.writer handles quoting of commas, quotes and newlines in stems
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["attempt", "question", "chosen", "correct", "answer"])
+    stems, answers = questions["stem"], questions["ans"]
+    writer.writerows(
+        (i, stems[h["q_idx"]], LETTERS[h["chosen"]], "TRUE" if h.get("correct") else "FALSE", LETTERS[answers[h["q_idx"]]])
+        for i, h in enumerate(history["items"], start=1)
+    )
+    csv_str = buf.getvalue()
     fname = f"quiz_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     return dict(content=csv_str, filename=fname)
 
 
 if __name__ == "__main__":
+    if os.environ.get("PRASHNAI_DEBUG"):
+        logging.basicConfig(level=logging.DEBUG)
     app.run(debug=True)
\ No newline at end of file
@@ -4,13 +4,23 @@ PrashnAI Quiz App with Bootstrap UI
 """
 import os
 import re
+import io
+import csv
 import base64
+import random
+import logging
+import functools
+from types import MappingProxyType
 from datetime import datetime
 
-from dash import Dash, dcc, html, Input, Output, State, callback_context, no_update
+from dash import Dash, dcc, html, Input, Output, State, ClientsideFunction, callback_context, no_update
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 
+# Status messages go through logging rather than print so callbacks don't
+# contend on stdout; logging is only configured when run as a script
+log = logging.getLogger(__name__)
+
 # Set QUIZ_DIR environment variable
 APP_DIR = os.path.dirname(__file__)
 QUIZ_DIR = os.path.join(APP_DIR, 'QUIZ_DIR')
@@ -22,74 +32,90 @@ os.makedirs(QUIZ_DIR, exist_ok=True)
 # Directory to store incorrect answers
 INCORRECT_DIR = os.path.join(APP_DIR, 'Incorrect')
 os.makedirs(INCORRECT_DIR, exist_ok=True)
-print(f"📂 Using quiz directory: {os.path.abspath(QUIZ_DIR)}")
+log.info("Using quiz directory: %s", os.path.abspath(QUIZ_DIR))
 ############################
 # Parsing & Utilities
 ############################
 
-QA_BLOCK_RE = re.compile(
-    r"(?ms)^(?:Q\s*)?(\d+)\s*(?::|\.)\s*(.*?)\n\s*A\)\s*(.*?)\n\s*B\)\s*(.*?)\n\s*C\)\s*(.*?)\n\s*D\)\s*(.*?)\n\s*Answer\s*:\s*([ABCD])\s*$")
+# Small anchored per-line patterns, compiled once; parse_quiz_text feeds them
+# one line at a time instead of running a block regex over the whole file
+_Q_RE = re.compile(r"^(Q\s*)?(\d+)\s*[:.]\s*(.*)")
+_OPT_RE = re.compile(r"^\s*([ABCD])\)\s*(.*)")
+_ANS_RE = re.compile(r"^\s*Answer\s*:\s*([ABCD])\s*$")
+_WS_RE = re.compile(r"\s+")
+_VARIANT_RE = re.compile(r"\(variant[^\)]*\)", re.IGNORECASE)
 
+# Tokenizer states: filling the stem, the options, or waiting for the answer
+QSTEM, OPTS, ANS = range(3)
+_OPTION_KEYS = "ABCD"
 
 
 def clean_text(s: str) -> str:
-    return re.sub(r"\s+", " ", s).strip()
+    return _WS_RE.sub(" ", s).strip()
 
 def normalize_stem(stem: str) -> str:
-    stem = re.sub(r"\(variant[^\)]*\)", "", stem, flags=re.IGNORECASE)
-    return clean_text(stem)
+    return clean_text(_VARIANT_RE.sub("", stem))
+
+
+def _make_block(qnum, stem_parts, opt_parts, ans):
+    stem_raw = " ".join(stem_parts)
+    stem = normalize_stem(stem_raw)
+    # Dedupe key: the casefolded stem, folded once here rather than per comparison
+    return stem.casefold(), {
+        "qnum": int(qnum),
+        "stem": stem,
+        "options": {k: clean_text(" ".join(parts)) for k, parts in zip(_OPTION_KEYS, opt_parts)},
+        "answer": ans,
+    }
 
 
 def parse_quiz_text(text: str, dedupe=True, max_questions=25):
-    """Parse quiz text into a list of question dicts."""
+    """Parse quiz text into a list of question dicts.
+    Single pass over the lines: a 'Q1:' or '1.' line opens a question, the
+    'A)'..'D)' lines must follow in order and 'Answer: X' closes it. Other
+    lines continue whatever is being filled. While a question is open only
+    the explicit 'Q1:' form starts a new one, so a numbered list in a stem
+    or a line like '2.5 + 3 = ?' stays part of the text being filled.
+    Both question styles are handled in this one pass:
+        Q1: Which mineral ...        1. Which mineral ...
+    so a file that yields nothing here has no questions in either format and
+    there is no second, re-split pass to fall back on.
+    """
     blocks = []
-    for match in QA_BLOCK_RE.finditer(text):
-        qnum = match.group(1)
-        stem_raw = match.group(2)
-        A, B, C, D = (match.group(3), match.group(4), match.group(5), match.group(6))
-        ans = match.group(7).upper()
-        stem = normalize_stem(stem_raw)
-        block = {
-            "qnum": int(qnum),
-            "stem": stem,
-            "stem_raw": clean_text(stem_raw),
-            "options": {"A": clean_text(A), "B": clean_text(B), "C": clean_text(C), "D": clean_text(D)},
-            "answer": ans,
-        }
-        blocks.append(block)
-
-    if not blocks:
-        # Try to be forgiving: chunk by lines that look like question starts in either format
-        # Supports:
-        #  - Q1: ...
-        #  - 1.  ...
-        chunks = re.split(r"(?m)^(?=(?:Q\s*)?\d+\s*(?::|\.))", text)
-        for ch in chunks:
-            m = QA_BLOCK_RE.search(ch)
+    seen = set() if dedupe else None
+    state = None
+    for line in text.splitlines():
+        m = _Q_RE.match(line)
+        if m and (state is None or m.group(1)):
+            qnum = m.group(2)
+            stem_parts = [m.group(3)]
+            opt_parts = ([], [], [], [])
+            opt_idx = -1
+            state = QSTEM
+            continue
+        if state is None:
+            continue
+        if state != ANS:
+            m = _OPT_RE.match(line)
+            if m and m.group(1) == _OPTION_KEYS[opt_idx + 1]:
+                opt_idx += 1
+                opt_parts[opt_idx].append(m.group(2))
+                state = ANS if opt_idx == 3 else OPTS
+                continue
+        else:
+            m = _ANS_RE.match(line)
             if m:
-                qnum = m.group(1)
-                stem_raw = m.group(2)
-                A, B, C, D = (m.group(3), m.group(4), m.group(5), m.group(6))
-                ans = m.group(7).upper()
-                stem = normalize_stem(stem_raw)
-                blocks.append({
-                    "qnum": int(qnum),
-                    "stem": stem,
-                    "stem_raw": clean_text(stem_raw),
-                    "options": {"A": clean_text(A), "B": clean_text(B), "C": clean_text(C), "D": clean_text(D)},
-                    "answer": ans,
-                })
-
-    if dedupe:
-        seen = set()
-        deduped = []
-        for b in blocks:
-            key = b["stem"].lower()
-            if key in seen:
+                key, block = _make_block(qnum, stem_parts, opt_parts, m.group(1))
+                if seen is None or key not in seen:
+                    if seen is not None:
+                        seen.add(key)
+                    blocks.append(block)
+                state = None
                 continue
-            seen.add(key)
-            deduped.append(b)
-        blocks = deduped
+        if opt_idx < 0:
+            stem_parts.append(line)
+        else:
+            opt_parts[opt_idx].append(line)
 
     blocks.sort(key=lambda x: x.get("qnum", 0))
 
@@ -100,22 +126,45 @@ def parse_quiz_text(text: str, dedupe=True, max_questions=25):
     return blocks
 
 
+# Directory listings keyed by path -> (st_mtime_ns, (topics, txt_files)).
+# A directory's mtime changes whenever an entry is added, removed or renamed,
+# so the dropdown callbacks only rescan when there is something new to see.
+_DIRLIST_CACHE = {}
+
+
+def _scan_dir(path):
+    """Return (topic options, .txt file options) for path, cached on its mtime"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _DIRLIST_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    dirs, txts = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                dirs.append(entry.name)
+            elif entry.name.lower().endswith(".txt"):
+                txts.append(entry.name)
+    listing = (
+        [{"label": n, "value": os.path.join(path, n)} for n in sorted(dirs)],
+        [{"label": n, "value": os.path.join(path, n)} for n in sorted(txts)],
+    )
+    _DIRLIST_CACHE[path] = (mtime, listing)
+    return listing
+
+
 def list_quiz_files():
     """Get list of quiz files from QUIZ_DIR"""
     items = []
     try:
         if os.path.isdir(QUIZ_DIR):
-            files = os.listdir(QUIZ_DIR)
-            if not files:
-                print("ℹ️ No quiz files found in the QUIZ_DIR. Please add .txt files to the directory.")
-            for fn in sorted(files):
-                if fn.lower().endswith(".txt"):
-                    full_path = os.path.join(QUIZ_DIR, fn)
-                    items.append({"label": fn, "value": full_path})
+            topics, items = _scan_dir(QUIZ_DIR)
+            if not topics and not items:
+                log.info("No quiz files found in the QUIZ_DIR. Please add .txt files to the directory.")
         else:
-            print(f"⚠️ QUIZ_DIR does not exist: {QUIZ_DIR}")
+            log.warning("QUIZ_DIR does not exist: %s", QUIZ_DIR)
     except Exception as e:
-        print(f"❌ Error listing quiz files: {str(e)}")
+        log.error("Error listing quiz files: %s", e, exc_info=True)
     return items
 
 
@@ -124,12 +173,9 @@ def list_topics():
     topics = []
     try:
         if os.path.isdir(QUIZ_DIR):
-            for name in sorted(os.listdir(QUIZ_DIR)):
-                path = os.path.join(QUIZ_DIR, name)
-                if os.path.isdir(path):
-                    topics.append({"label": name, "value": path})
+            topics = _scan_dir(QUIZ_DIR)[0]
     except Exception as e:
-        print(f"❌ Error listing topics: {str(e)}")
+        log.error("Error listing topics: %s", e, exc_info=True)
     return topics
 
 
@@ -140,28 +186,51 @@ def list_topic_files(topic_path):
         return items
     try:
         if os.path.isdir(topic_path):
-            for fn in sorted(os.listdir(topic_path)):
-                if fn.lower().endswith(".txt"):
-                    full_path = os.path.join(topic_path, fn)
-                    items.append({"label": fn, "value": full_path})
+            items = _scan_dir(topic_path)[1]
     except Exception as e:
-        print(f"❌ Error listing files for topic '{topic_path}': {str(e)}")
+        log.error("Error listing files for topic '%s': %s", topic_path, e, exc_info=True)
     return items
 
 
 def decode_upload(contents):
     """Decode uploaded file contents"""
-    content_type, content_string = contents.split(',')
-    decoded = base64.b64decode(content_string)
-    return decoded.decode('utf-8', errors='ignore')
+    # partition hands back the payload without building a list of pieces
+    _, _, content_string = contents.partition(',')
+    return base64.b64decode(content_string).decode('utf-8', errors='ignore')
+
+
+def compact_questions(blocks):
+    """Pack parsed question dicts into the parallel-array form kept in the stores:
+    {"stems": [...], "opts": [[A, B, C, D], ...], "ans": "BCA..."}
+    """
+    return {
+        "stems": [q["stem"] for q in blocks],
+        "opts": [[q["options"][k] for k in _OPTION_KEYS] for q in blocks],
+        "ans": "".join(q["answer"] for q in blocks),
+    }
+
+
+def _freeze(block):
+    """Read-only view of a parsed question so cached entries can't be mutated by callers"""
+    return MappingProxyType({**block, "options": MappingProxyType(block["options"])})
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_cached(path, mtime_ns, dedupe):
+    """Parse a quiz file once per (path, mtime); reselecting an unchanged file is a cache hit"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return tuple(_freeze(b) for b in parse_quiz_text(f.read(), dedupe=dedupe, max_questions=1000))
+
+
+# Module-level generator shared by sampling and shuffling
+_RNG = random.Random()
 
 
 def get_random_questions(all_questions, count=25):
     """Get a random selection of questions from all available questions"""
-    import random
     if len(all_questions) <= count:
         return all_questions
-    return random.sample(all_questions, count)
+    return _RNG.sample(all_questions, count)
 
 
 ############################
@@ -190,7 +259,7 @@ D) Cl-
 Answer: C
 """
 
-DEFAULT_QUESTIONS = parse_quiz_text(SAMPLE_TEXT, dedupe=True)
+DEFAULT_QUESTIONS = compact_questions(parse_quiz_text(SAMPLE_TEXT, dedupe=True))
 
 ############################
 # Dash App
@@ -270,13 +339,16 @@ app.layout = dbc.Container(fluid=True, children=[
                             ),
                         ])
                     ]),
-                    # Status
-                    dbc.Alert(
-                        "Please select a quiz file to begin",
-                        id="status",
-                        color="light",
-                        className="mb-3",
-                        style={"wordBreak": "break-word"}
+                    # Status; only load_quiz writes it, so the spinner covers exactly a file load
+                    dcc.Loading(
+                        dbc.Alert(
+                            "Please select a quiz file to begin",
+                            id="status",
+                            color="light",
+                            className="mb-3",
+                            style={"wordBreak": "break-word"}
+                        ),
+                        type="circle",
                     ),
                     dbc.Alert(
                         "ℹ️ On file selection, 50 random questions are loaded (or all if fewer than 50).",
@@ -373,6 +445,7 @@ app.layout.children.extend([
     dcc.Store(id="order-store", data=[]),
     dcc.Store(id="index-store", data=0),
     dcc.Store(id="history-store", data=[]),
+    dcc.Store(id="last-answer-store", data=None),
     dcc.Store(id="incorrect-file-store", data=None),
 ])
 
@@ -402,17 +475,17 @@ def load_quiz(file_path, dedupe, shuffle, all_questions):
     
     if file_path:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                text = f.read()
-            all_questions = parse_quiz_text(text, dedupe=dedupe_on, max_questions=1000)
-            questions = get_random_questions(all_questions, 50)  # Load random 50
+            blocks = _parse_cached(file_path, os.stat(file_path).st_mtime_ns, bool(dedupe_on))
+            picked = get_random_questions(blocks, 50)  # Load random 50
+            questions = compact_questions(picked)
+            all_questions = compact_questions(blocks)
             # derive Subject and Topic for incorrect file name
             subject = os.path.basename(os.path.dirname(file_path)) or "UnknownSubject"
             topic = os.path.splitext(os.path.basename(file_path))[0] or "UnknownTopic"
             ts = datetime.now().strftime('%Y%m%d_%H%M%S')
             incorrect_filename = f"{subject}_{topic}_{ts}.csv"
             incorrect_path = os.path.join(INCORRECT_DIR, incorrect_filename)
-            status = f"✅ Loaded {len(questions)} random questions from {os.path.basename(file_path)} (source has {len(all_questions)})"
+            status = f"✅ Loaded {len(picked)} random questions from {os.path.basename(file_path)} (source has {len(blocks)})"
             color = "success"
         except Exception as e:
             questions = DEFAULT_QUESTIONS
@@ -428,15 +501,16 @@ def load_quiz(file_path, dedupe, shuffle, all_questions):
         color = "light"
 
     # Create order
-    order = list(range(len(questions)))
+    order = list(range(len(questions["stems"]) if questions else 0))
     if shuffle_on and questions:
-        import random
-        random.shuffle(order)
+        _RNG.shuffle(order)
 
     return questions, all_questions, order, 0, [], incorrect_path, status, color
 
 
-@app.callback(
+# Rendered in the browser by assets/quiz.js; the stores already hold everything it needs
+app.clientside_callback(
+    ClientsideFunction(namespace="quiz", function_name="show"),
     [Output("question-display", "children"),
      Output("choices", "options"),
      Output("choices", "value"),
@@ -445,32 +519,13 @@ def load_quiz(file_path, dedupe, shuffle, all_questions):
      Input("order-store", "data"),
      Input("index-store", "data")]
 )
-def display_question(questions, order, index):
-    """Display the current question"""
-    if not questions or not order or index >= len(order):
-        return "No questions available", [], None, ""
-
-    question = questions[order[index]]
-    stem = question["stem"]
-    options = question["options"]
-
-    choices_options = [
-        {"label": f"A) {options['A']}", "value": "A"},
-        {"label": f"B) {options['B']}", "value": "B"},
-        {"label": f"C) {options['C']}", "value": "C"},
-        {"label": f"D) {options['D']}", "value": "D"},
-    ]
-
-    progress = f"Question {index + 1} of {len(order)}"
-
-    return stem, choices_options, None, progress
 
 
 @app.callback(
     [Output("feedback", "children"),
      Output("feedback", "color"),
      Output("feedback", "style"),
-     Output("history-store", "data", allow_duplicate=True),
+     Output("last-answer-store", "data"),
      Output("index-store", "data", allow_duplicate=True)],
     [Input("submit", "n_clicks"),
      Input("next", "n_clicks")],
@@ -493,35 +548,36 @@ def handle_actions(submit, next_click, selected, questions, order, index, histor
             prev = next((h for h in history if h.get("index") == index), None)
             if prev is not None:
                 was_correct = prev.get("correct", False)
-                answer = prev.get("answer")
+                answer = questions["ans"][order[index]]
                 if was_correct:
                     feedback = f"✅ Correct! The answer is {answer}"
                     color = "success"
                 else:
                     feedback = f"❌ Incorrect. The correct answer is {answer}"
                     color = "danger"
-                return feedback, color, {"display": "block"}, history, no_update
+                return feedback, color, {"display": "block"}, no_update, no_update
 
         if not selected:
-            return "Please select an answer first!", "danger", {"display": "block"}, history, no_update
+            return "Please select an answer first!", "danger", {"display": "block"}, no_update, no_update
 
-        question = questions[order[index]]
-        correct = selected == question["answer"]
+        qi = order[index]
+        stem = questions["stems"][qi]
+        answer = questions["ans"][qi]
+        correct = selected == answer
 
-        # Add to history
-        new_history = history + [{
+        # Only the new entry goes back; the browser appends it to history-store.
+        # Question text and answer are looked up from questions-store when needed
+        entry = {
             "index": index,
-            "question": question["stem"],
             "selected": selected,
             "correct": correct,
-            "answer": question["answer"]
-        }]
+        }
 
         if correct:
-            feedback = f"✅ Correct! The answer is {question['answer']}"
+            feedback = f"✅ Correct! The answer is {answer}"
             color = "success"
         else:
-            feedback = f"❌ Incorrect. The correct answer is {question['answer']}"
+            feedback = f"❌ Incorrect. The correct answer is {answer}"
             color = "danger"
 
             # Persist incorrect answer to CSV in Incorrect directory
@@ -531,9 +587,9 @@ def handle_actions(submit, next_click, selected, questions, order, index, histor
                     row = [
                         datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                         str(index + 1),
-                        question["stem"],
+                        stem,
                         selected,
-                        question["answer"]
+                        answer
                     ]
                     # Write header if file doesn't exist yet
                     needs_header = not os.path.exists(incorrect_file_path) or os.path.getsize(incorrect_file_path) == 0
@@ -541,7 +597,7 @@ def handle_actions(submit, next_click, selected, questions, order, index, histor
                         if needs_header:
                             f.write('timestamp,question_index,question,selected,correct\n')
                         # Escape quotes and commas in question text by wrapping in double quotes
-                        safe_question = '"' + question["stem"].replace('"', '""') + '"'
+                        safe_question = '"' + stem.replace('"', '""') + '"'
                         f.write(f"{row[0]},{row[1]},{safe_question},{row[3]},{row[4]}\n")
                 except Exception as _:
                     # Ignore file write errors to not break UX
@@ -549,14 +605,23 @@ def handle_actions(submit, next_click, selected, questions, order, index, histor
 
         # Auto-advance to next question after submit
         new_index = min(index + 1, len(order) - 1) if order else index
-        return feedback, color, {"display": "block"}, new_history, new_index
+        return feedback, color, {"display": "block"}, entry, new_index
 
     elif trigger == "next.n_clicks":
         # Manual next: advance index and hide feedback
         new_index = min(index + 1, len(order) - 1) if order else index
-        return "", "light", {"display": "none"}, history, new_index
+        return "", "light", {"display": "none"}, no_update, new_index
 
-    return "", "light", {"display": "none"}, history, index
+    return "", "light", {"display": "none"}, no_update, index
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace="quiz", function_name="append_history"),
+    Output("history-store", "data", allow_duplicate=True),
+    Input("last-answer-store", "data"),
+    State("history-store", "data"),
+    prevent_initial_call=True
+)
 
 
 @app.callback(
@@ -572,13 +637,11 @@ def update_file_options(topic_path):
     return options, None
 
 
-@app.callback(
-    Output("score-chart", "figure"),
-    [Input("history-store", "data")]
-)
-def update_chart(history):
-    """Update the score chart"""
-    if not history:
+@functools.lru_cache(maxsize=256)
+def _chart_for(correct, total):
+    """Score chart for a (correct, total) pair as a plain figure dict.
+    The chart depends on nothing else, so each state is built once."""
+    if not total:
         fig = go.Figure()
         fig.add_annotation(
             text="No answers yet",
@@ -601,10 +664,7 @@ def update_chart(history):
             margin=dict(l=50, r=50, t=50, b=50),
             height=300
         )
-        return fig
-
-    correct = sum(1 for h in history if h["correct"])
-    total = len(history)
+        return fig.to_dict()
 
     fig = go.Figure(go.Bar(
         x=["Correct", "Incorrect"],
@@ -650,29 +710,53 @@ def update_chart(history):
         marker_line_width=1.5,
         opacity=0.9
     )
-    return fig
+    return fig.to_dict()
+
+
+@app.callback(
+    Output("score-chart", "figure"),
+    [Input("history-store", "data")]
+)
+def update_chart(history):
+    """Update the score chart"""
+    if not history:
+        return _chart_for(0, 0)
+    return _chart_for(sum(h["correct"] for h in history), len(history))
 
 
 @app.callback(
     Output("download-data", "data"),
     [Input("download-btn", "n_clicks")],
-    [State("history-store", "data")],
+    [State("history-store", "data"),
+     State("questions-store", "data"),
+     State("order-store", "data")],
     prevent_initial_call=True
 )
-def download_results(n_clicks, history):
+def download_results(n_clicks, history, questions, order):
     """Download results as CSV"""
     if not history:
         return no_update
 
-    csv_content = "Question,Selected,Correct,Answer\n"
-    for h in history:
-        csv_content += f'"{h["question"]}",{h["selected"]},{h["correct"]},{h["answer"]}\n'
+    # csv.writer handles quotes/commas inside the question text
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(("Question", "Selected", "Correct", "Answer"))
+    stems, ans = questions["stems"], questions["ans"]
+    w.writerows(
+        (stems[order[h["index"]]], h["selected"], h["correct"], ans[order[h["index"]]])
+        for h in history
+    )
 
     filename = f"quiz_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    return dict(content=csv_content, filename=filename)
+    return dict(content=buf.getvalue(), filename=filename)
 
 
 if __name__ == "__main__":
+    # Set LOG_LEVEL=WARNING to silence the routine status messages
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    )
     print("🚀 Starting PrashnAI Quiz App...")
     print(f"📁 Quiz directory: {QUIZ_DIR}")
     print(f"📄 Available files: {len(quiz_files)}")
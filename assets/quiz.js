@@ -0,0 +1,27 @@
+// Clientside callbacks for app_simple.py; Dash serves this file from assets/.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    quiz: {
+        // Render the current question straight from questions-store/order-store,
+        // so Next/Submit don't need a server round-trip just to swap the text.
+        show: function (questions, order, index) {
+            if (!questions || !questions.stems || !order || !order.length || index >= order.length) {
+                return ["No questions available", [], null, ""];
+            }
+            var qi = order[index];
+            var keys = "ABCD";
+            var options = questions.opts[qi].map(function (opt, k) {
+                return {label: keys[k] + ") " + opt, value: keys[k]};
+            });
+            return [questions.stems[qi], options, null, "Question " + (index + 1) + " of " + order.length];
+        },
+
+        // Append the entry handle_actions just graded, so the server never
+        // has to send the whole history back on Submit.
+        append_history: function (entry, history) {
+            if (!entry) {
+                return window.dash_clientside.no_update;
+            }
+            return (history || []).concat([entry]);
+        }
+    }
+});
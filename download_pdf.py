@@ -1,10 +1,29 @@
 import os
 import re
+import logging
+import threading
 import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
+from urllib3.util.retry import Retry
 
-def download_pdfs_from_page(page_url, match_text, download_folder="pdf_downloads"):
+# Anything that isn't a letter, digit or space (\w also covers '_', so drop that too)
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w ]|_")
+
+# PDFs are streamed to disk in chunks of this size rather than held in memory
+CHUNK = 1 << 18  # 256 KiB
+
+log = logging.getLogger(__name__)
+
+# href prefixes that don't point at a downloadable document
+_NON_DOWNLOAD_HREFS = ("#", "mailto:", "javascript:", "tel:")
+
+# Downloads are I/O-bound, so a handful of threads keeps the link busy
+MAX_WORKERS = 8
+
+def download_pdfs_from_page(page_url, match_text, download_folder="pdf_downloads", max_workers=MAX_WORKERS):
     """
     Downloads PDFs from a webpage whose link text matches a given string.
 
@@ -12,6 +31,7 @@ def download_pdfs_from_page(page_url, match_text, download_folder="pdf_downloads
         page_url (str): The URL of the webpage to scan.
         match_text (str): Substring to match in the link text.
         download_folder (str): Folder to save downloaded PDFs (default: "pdf_downloads").
+        max_workers (int): Number of PDFs downloaded at once (default: MAX_WORKERS).
     """
     # Create folder if it doesn't exist
     os.makedirs(download_folder, exist_ok=True)
@@ -26,61 +46,101 @@ def download_pdfs_from_page(page_url, match_text, download_folder="pdf_downloads
         "Referer": "https://science.osti.gov/",
     }
 
+    # One keep-alive session for the page and every PDF, pooled and retried
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=max(16, max_workers),
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
     # Get webpage content
-    print(f"Fetching page: {page_url}")
-    response = requests.get(page_url, headers=headers)
+    log.info("Fetching page: %s", page_url)
+    response = session.get(page_url)
     response.raise_for_status()  # Ensure request succeeded
 
-    # Parse HTML
-    soup = BeautifulSoup(response.text, "html.parser")
+    # Parse HTML with lxml, keeping only <a href> tags; raw bytes let lxml do the decoding
+    soup = BeautifulSoup(response.content, "lxml", parse_only=SoupStrainer("a", href=True))
 
-    # Find all links
-    links = soup.find_all("a", href=True)
+    # Compile the link-text pattern once for the whole page
+    pattern = re.compile(match_text, re.IGNORECASE)
 
-    # Iterate over matching links
-    for link in links:
-        link_text = link.get_text(strip=True)
+    # Collect matching links up front, then fan the downloads out to a thread pool
+    matching_links = []
+    for link in soup.find_all("a", href=True):
         href = link["href"]
+        # In-page anchors and mailto/javascript links can never be a PDF; skip them before get_text()
+        if href.startswith(_NON_DOWNLOAD_HREFS):
+            continue
+        link_text = link.get_text(strip=True)
 
         # Match link text to given string
-        if re.search(match_text, link_text, re.IGNORECASE):
+        if pattern.search(link_text):
             pdf_url = urljoin(page_url, href)
-            print(f"\nFound matching link:")
-            print(f"Text: {link_text}")
-            print(f"URL:  {pdf_url}")
-
-            try:
-                # Get the headers first to check content type
-                print("Checking content type...")
-                head_response = requests.head(pdf_url, allow_redirects=True, headers=headers)
-                content_type = head_response.headers.get('content-type', '').lower()
-                
-                if 'pdf' in content_type:
-                    # Create a base safe filename from the link text
-                    safe_filename = "".join([c for c in link_text if c.isalpha() or c.isdigit() or c==' ']).rstrip()
-                    safe_filename = safe_filename.replace(' ', '_')
-                    
-                    # Handle duplicate filenames
+            log.info("Found matching link: %s -> %s", link_text, pdf_url)
+            matching_links.append((link_text, pdf_url))
+
+    # Filenames picked by workers that may not exist on disk yet
+    reserved = set()
+    name_lock = threading.Lock()
+
+    def _fetch_one(link):
+        link_text, pdf_url = link
+        part_path = None
+        try:
+            # Check the content type on the GET itself instead of a separate HEAD;
+            # the body isn't read until we decide to keep it
+            with session.get(pdf_url, stream=True, timeout=30) as pdf_data:
+                pdf_data.raise_for_status()
+                content_type = pdf_data.headers.get('content-type', '').lower()
+                if 'pdf' not in content_type:
+                    return False, f"Skipping {pdf_url} - Not a PDF (Content-Type: {content_type})"
+
+                # Create a base safe filename from the link text
+                safe_filename = _UNSAFE_FILENAME_RE.sub("", link_text).rstrip()
+                safe_filename = safe_filename.replace(' ', '_')
+
+                # Handle duplicate filenames; hold the lock so two workers can't pick the same one
+                with name_lock:
                     filename = os.path.join(download_folder, f"{safe_filename}.pdf")
                     counter = 1
-                    while os.path.exists(filename):
+                    while filename in reserved or os.path.exists(filename):
                         filename = os.path.join(download_folder, f"{safe_filename}_{counter}.pdf")
                         counter += 1
-                    
-                    print(f"Downloading PDF to: {filename}")
-                    pdf_data = requests.get(pdf_url, headers=headers)
-                    pdf_data.raise_for_status()
-                    
-                    with open(filename, "wb") as f:
-                        f.write(pdf_data.content)
-                    print("✅ Download complete.")
-                else:
-                    print(f"Skipping - Not a PDF (Content-Type: {content_type})")
-                    
-            except Exception as e:
-                print(f"❌ Error processing {pdf_url}: {str(e)}")
+                    reserved.add(filename)
+
+                # Stream into a .part file and only move it into place once the body is
+                # complete, so a dropped connection never leaves a truncated PDF behind
+                part_path = filename + ".part"
+                with open(part_path, "wb", buffering=CHUNK) as f:
+                    for chunk in pdf_data.iter_content(CHUNK):
+                        f.write(chunk)
+                os.replace(part_path, filename)
+            return True, f"Downloaded {pdf_url} -> {filename}"
+
+        except Exception as e:
+            if part_path is not None:
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+            return False, f"Error processing {pdf_url}: {e}"
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for ok, msg in executor.map(_fetch_one, matching_links):
+            if ok:
+                log.info(msg)
+            else:
+                log.warning(msg)
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    )
     # Example usage:
     # Replace with your page URL and text to match
     url = "https://science.osti.gov/wdts/nsb/Regional-Competitions/Resources/MS-Sample-Questions"
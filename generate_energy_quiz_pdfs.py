@@ -1,121 +1,181 @@
 import argparse
+import functools
+import io
+import multiprocessing
 import os
 import random
 import re
 from datetime import datetime
 
-# PDF generation
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+# reportlab and python-docx are imported inside the builders that use them,
+# so a run that only writes one format never loads the other library
 
-# DOCX generation
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+# Parsing patterns, compiled once; fix_spacing_artifacts runs twice per question
+_SPLIT_RE = re.compile(r"^(\d+)\.\s", re.M)
+_ANSWER_LINE_RE = re.compile(r"^ANSWER\s*:\s*(.+)$", re.I | re.M)
+# Line-start form first, then the inline form (DOTALL only for that branch), in one scan
+_ANSWER_RE = re.compile(r"^ANSWER\s*:\s*(.+)$|(?s:ANSWER\s*:\s*(.+?)\s*(?:\n\s*\n|\Z))", re.I | re.M)
+_HYPH_NL_RE = re.compile(r"(\w)[ \t]*-[ \t]*\n[ \t]*(\w)")
+_HYPH_SP_RE = re.compile(r"(\w)-\s+(\w)")
+_PUNCT_RE = re.compile(r"\s+([.,;:!?])")
+_WS_RE = re.compile(r"[ \t]{2,}")
 
 
-def load_questions(input_path: str) -> list[dict]:
+def load_questions(input_path: str, *, keep_orig_number: bool = True) -> list[dict]:
     """Parse questions from Energy_TossUps_All.txt created by extract_energy_tossups.py
 
     Expected block format per question:
       "<n>. <body>\nANSWER: <answer>\n\n"
     We will parse robustly via regex.
+    Results are cached on the file's (mtime, size), so repeat calls on an
+    unchanged file skip the parse. The question dicts are shared with the
+    cache and should be treated as read-only.
+    keep_orig_number=False leaves out the 'orig_number' field for callers
+    that never look at a question's position in the source file.
     """
+    st = os.stat(input_path)
+    return list(_load_questions_cached(input_path, st.st_mtime_ns, st.st_size, keep_orig_number))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_questions_cached(input_path: str, mtime_ns: int, size: int,
+                           keep_orig_number: bool = True) -> tuple[dict, ...]:
     with open(input_path, 'r', encoding='utf-8') as f:
         text = f.read()
 
     # Split into entries: a line starting with number dot space
-    # Keep the number to preserve original index if needed
-    blocks = re.split(r"(?m)^(\d+)\.\s", text)
-    # re.split returns [pre, num1, rest1, num2, rest2, ...]; discard preamble
+    # Keep the number to preserve original index if asked for
+    # Each entry runs from the end of its "<n>. " to the start of the next one;
+    # anything before the first match is preamble and is skipped
+    matches = list(_SPLIT_RE.finditer(text))
     questions = []
-    for i in range(1, len(blocks), 2):
-        num = blocks[i]
-        rest = blocks[i + 1]
+    for i, m in enumerate(matches):
+        num = m.group(1)
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        rest = text[m.end():end]
         # The 'rest' contains body + possibly following blocks; stop at next double newline followed by number or end
         # More robust: find 'ANSWER:' within rest
         # Extract up to the next blank line that precedes another numbered question or end
         # First, try to split out the answer
         body, answer = split_body_answer(rest)
-        body = fix_spacing_artifacts(body.strip())
-        answer = fix_spacing_artifacts(answer.strip()) if answer else ""
-        questions.append({
-            'orig_number': int(num),
-            'body': body,
-            'answer': answer,
-        })
-    return questions
+        # split_body_answer already strips both parts
+        body = fix_spacing_artifacts(body)
+        answer = fix_spacing_artifacts(answer) if answer else ""
+        q = {'orig_number': int(num)} if keep_orig_number else {}
+        q['body'] = body
+        q['answer'] = answer
+        questions.append(q)
+    return tuple(questions)
 
 
 def split_body_answer(block_tail: str) -> tuple[str, str]:
     """Given the text right after '<n>. ', return (body, answer).
     We expect 'ANSWER:' line somewhere after body.
     """
-    # Find ANSWER: ... to end of line
-    m = re.search(r"(?im)^ANSWER\s*:\s*(.+)$", block_tail)
-    if m:
-        answer = m.group(1).strip()
-        body = block_tail[:m.start()].strip()
-        # Trim trailing blank lines from body
-        body = re.sub(r"\s+$", "", body)
-        return body, answer
-    # Fallback: try inline ANSWER if on same paragraph
-    m = re.search(r"(?is)ANSWER\s*:\s*(.+?)\s*(?:\n\s*\n|$)", block_tail)
-    if m:
-        answer = m.group(1).strip()
-        body = block_tail[:m.start()].strip()
-        return body, answer
-    # No answer found; treat whole as body
-    return block_tail.strip(), ""
+    # Find ANSWER: ... to end of line, or failing that an inline ANSWER in the same paragraph
+    m = _ANSWER_RE.search(block_tail)
+    if m is None:
+        # No answer found; treat whole as body
+        return block_tail.strip(), ""
+    if m.group(1) is None:
+        # Hit the inline form first; a line-start ANSWER further on still takes precedence
+        m = _ANSWER_LINE_RE.search(block_tail, m.start() + 1) or m
+    answer = m.group(m.lastindex).strip()
+    # strip() also trims trailing blank lines from body
+    body = block_tail[:m.start()].strip()
+    return body, answer
 
 
 def fix_spacing_artifacts(text: str) -> str:
     """Fix common PDF spacing artifacts conservatively.
     Mirrors the logic in extract_energy_tossups.py for consistency.
     """
-    # Join hyphen followed by linebreaks/spaces
-    text = re.sub(r"(\w)[ \t]*-[ \t]*\n[ \t]*(\w)", r"\1\2", text)
-    # Also join hyphenations split across lines
-    text = re.sub(r"(\w)-\s+(\w)", r"\1\2", text)
+    # Nothing to fix in an empty string or a lone letter/digit
+    if not text or (len(text) < 2 and text.isalnum()):
+        return text
+    # Cheap substring checks skip a pattern when its literal part can't be present
+    if "-" in text:
+        # Join hyphen followed by linebreaks/spaces
+        text = _HYPH_NL_RE.sub(r"\1\2", text)
+        # Also join hyphenations split across lines
+        text = _HYPH_SP_RE.sub(r"\1\2", text)
     # Remove spaces before punctuation
-    text = re.sub(r"\s+([.,;:!?])", r"\1", text)
-    # Normalize multiple spaces within lines
-    text = "\n".join(re.sub(r"[ \t]{2,}", " ", ln) for ln in text.split("\n"))
+    text = _PUNCT_RE.sub(r"\1", text)
+    # Normalize multiple spaces within lines ([ \t] never spans a newline, so one pass covers every line)
+    if "  " in text or "\t" in text:
+        text = _WS_RE.sub(" ", text)
     return text.strip()
 
 
 def pick_unique_questions(questions: list[dict], k: int, seed: int | None = None) -> list[dict]:
-    if seed is not None:
-        rnd = random.Random(seed)
-    else:
-        rnd = random
     if k > len(questions):
         raise ValueError(f"Requested {k} questions but only {len(questions)} available")
-    return rnd.sample(questions, k)
+    # A private generator either way; Random(None) seeds itself from the OS
+    return random.Random(seed).sample(questions, k)
 
 
-def build_pdf(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1) -> None:
+def _timestamp() -> str:
+    """The 'Generated:' stamp printed under each title."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M')
+
+
+def _write_file(output_path: str, buf: io.BytesIO) -> None:
+    """Write a document rendered in memory to disk in one go.
+    reportlab and python-docx otherwise stream many small writes to the file.
+    """
+    with open(output_path, 'wb') as f:
+        f.write(buf.getbuffer())
+
+
+# Shared PDF styles, built on first use; every build in a run reuses the same objects
+_STYLES = None
+_Q_STYLE = None
+_A_STYLE = None
+_Q_STYLE_BIG = None
+_A_STYLE_BIG = None
+
+
+def _get_styles(big: bool = False):
+    """Return (stylesheet, question style, answer style).
+    big=True gives the 11pt pair used by the split questions/answer-key PDFs.
+    """
+    global _STYLES, _Q_STYLE, _A_STYLE, _Q_STYLE_BIG, _A_STYLE_BIG
+    if _STYLES is None:
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        styles = getSampleStyleSheet()
+        styles['Heading1'].spaceAfter = 12
+        _Q_STYLE = ParagraphStyle('Question', parent=styles['Normal'], fontSize=10.5, leading=14)
+        _A_STYLE = ParagraphStyle('Answer', parent=styles['Normal'], fontSize=10, leading=13)
+        _Q_STYLE_BIG = ParagraphStyle('Question', parent=styles['Normal'], fontSize=11, leading=15)
+        _A_STYLE_BIG = ParagraphStyle('Answer', parent=styles['Normal'], fontSize=11, leading=15)
+        _STYLES = styles
+    if big:
+        return _STYLES, _Q_STYLE_BIG, _A_STYLE_BIG
+    return _STYLES, _Q_STYLE, _A_STYLE
+
+
+def build_pdf(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1,
+              *, generated_at: str | None = None) -> None:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buf = io.BytesIO()
     doc = SimpleDocTemplate(
-        output_path,
+        buf,
         pagesize=letter,
         rightMargin=0.75 * inch,
         leftMargin=0.75 * inch,
         topMargin=0.75 * inch,
         bottomMargin=0.75 * inch,
     )
-    styles = getSampleStyleSheet()
-    # Tweak styles
+    styles, q_style, a_style = _get_styles()
     title_style = styles['Heading1']
-    title_style.spaceAfter = 12
-    q_style = ParagraphStyle(
-        'Question', parent=styles['Normal'], fontSize=10.5, leading=14
-    )
-    a_style = ParagraphStyle('Answer', parent=styles['Normal'], fontSize=10, leading=13)
 
+    # doc.build() consumes this list in place, deleting each flowable once it is
+    # laid out, so it has to be a real list rather than a generator
     story = []
-    now = datetime.now().strftime('%Y-%m-%d %H:%M')
+    now = generated_at or _timestamp()
     title_text = f"Energy Toss-Up Set {title_suffix}".strip()
     story.append(Paragraph(title_text or "Energy Toss-Up Set", title_style))
     story.append(Paragraph(f"Generated: {now}", styles['Italic']))
@@ -124,183 +184,341 @@ def build_pdf(output_path: str, selected: list[dict], title_suffix: str = "", st
     # Questions with inline answers
     for idx, q in enumerate(selected, start=start_number):
         # Body: prefix with Q{n}:
-        body_html = escape_html(q['body']).replace('\n', '<br/>')
-        q_para = Paragraph(f"Q{idx}: {body_html}", q_style)
+        q_para = Paragraph(f"Q{idx}: {_body_html(q)}", q_style)
         story.append(q_para)
         # Inline answer immediately after the question
-        ans_text = q['answer'] or "[NOT FOUND]"
-        a_para = Paragraph(f"Answer: {escape_html(ans_text)}", a_style)
+        a_para = Paragraph(f"Answer: {_ans_html(q)}", a_style)
         story.append(a_para)
         story.append(Spacer(1, 0.18 * inch))
 
     doc.build(story)
+    _write_file(output_path, buf)
+
+
+@functools.lru_cache(maxsize=None)
+def _has_intense_quote() -> bool:
+    """Whether python-docx's default template defines 'Intense Quote'.
+    Every Document() starts from that same template, so one probe answers
+    it for the whole run instead of a styles scan per document.
+    """
+    from docx import Document
+    return 'Intense Quote' in Document().styles
+
+
+@functools.lru_cache(maxsize=None)
+def _docx_margin():
+    """Page margin for the docx outputs (approx 0.75"), converted to EMU once."""
+    from docx.shared import Inches
+    return Inches(0.75)
+
+
+def _remove_paragraph(p) -> None:
+    """Detach a paragraph from its document.
+
+    Document.add_paragraph() looks for the body's trailing sectPr on every
+    call, so appending N paragraphs that way is quadratic. The docx builders
+    instead insert before an empty sentinel paragraph (constant time) and
+    drop the sentinel with this just before saving.
+    """
+    p._element.getparent().remove(p._element)
 
 
-def build_docx_inline(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1) -> None:
+def build_docx_inline(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1,
+                      *, generated_at: str | None = None) -> None:
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
     doc = Document()
     # Margins (approx 0.75")
     sections = doc.sections
+    margin = _docx_margin()
     for sec in sections:
-        sec.top_margin = Inches(0.75)
-        sec.bottom_margin = Inches(0.75)
-        sec.left_margin = Inches(0.75)
-        sec.right_margin = Inches(0.75)
+        sec.top_margin = margin
+        sec.bottom_margin = margin
+        sec.left_margin = margin
+        sec.right_margin = margin
+    # Everything is inserted before a trailing sentinel paragraph (see _remove_paragraph)
+    sentinel = doc.add_paragraph()
 
     # Title
-    title = doc.add_paragraph()
+    title = sentinel.insert_paragraph_before()
     run = title.add_run(f"Energy Toss-Up Set {title_suffix}".strip() or "Energy Toss-Up Set")
     run.bold = True
     run.font.size = Pt(18)
     title.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-    meta = doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    meta.style = doc.styles['Intense Quote'] if 'Intense Quote' in doc.styles else None
+    meta = sentinel.insert_paragraph_before(f"Generated: {generated_at or _timestamp()}")
+    meta.style = doc.styles['Intense Quote'] if _has_intense_quote() else None
 
-    doc.add_paragraph("")
+    sentinel.insert_paragraph_before("")
 
     for idx, q in enumerate(selected, start=start_number):
-        p = doc.add_paragraph()
+        p = sentinel.insert_paragraph_before()
         run = p.add_run(f"Q{idx}: ")
         run.bold = True
         run.font.size = Pt(11)
         # Body with preserved line breaks
-        for j, line in enumerate(q['body'].split('\n')):
-            if j == 0:
-                p.add_run(line)
-            else:
-                p = doc.add_paragraph(line)
-        a = doc.add_paragraph()
-        a_run = a.add_run(f"Answer: {q['answer'] or '[NOT FOUND]'}")
+        # First line joins the Q{n} paragraph; any further lines get their own
+        lines = _body_lines(q)
+        p.add_run(lines[0])
+        for line in lines[1:]:
+            sentinel.insert_paragraph_before(line)
+        a = sentinel.insert_paragraph_before()
+        a_run = a.add_run(f"Answer: {_ans(q)}")
         a_run.font.size = Pt(10.5)
-        doc.add_paragraph("")
+        sentinel.insert_paragraph_before("")
+
+    _remove_paragraph(sentinel)
+    buf = io.BytesIO()
+    doc.save(buf)
+    _write_file(output_path, buf)
 
-    doc.save(output_path)
 
+def build_docx_questions(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1,
+                         *, generated_at: str | None = None) -> None:
+    from docx import Document
+    from docx.shared import Pt
 
-def build_docx_questions(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1) -> None:
     doc = Document()
     sections = doc.sections
+    margin = _docx_margin()
     for sec in sections:
-        sec.top_margin = Inches(0.75)
-        sec.bottom_margin = Inches(0.75)
-        sec.left_margin = Inches(0.75)
-        sec.right_margin = Inches(0.75)
+        sec.top_margin = margin
+        sec.bottom_margin = margin
+        sec.left_margin = margin
+        sec.right_margin = margin
+    sentinel = doc.add_paragraph()
 
-    title = doc.add_paragraph()
+    title = sentinel.insert_paragraph_before()
     run = title.add_run(f"Energy Toss-Up Questions {title_suffix}".strip() or "Energy Toss-Up Questions")
     run.bold = True
     run.font.size = Pt(18)
-    doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    doc.add_paragraph("")
+    sentinel.insert_paragraph_before(f"Generated: {generated_at or _timestamp()}")
+    sentinel.insert_paragraph_before("")
 
     for idx, q in enumerate(selected, start=start_number):
-        p = doc.add_paragraph()
+        p = sentinel.insert_paragraph_before()
         run = p.add_run(f"Q{idx}: ")
         run.bold = True
         run.font.size = Pt(11)
-        for j, line in enumerate(q['body'].split('\n')):
-            if j == 0:
-                p.add_run(line)
-            else:
-                doc.add_paragraph(line)
-        doc.add_paragraph("")
+        # First line joins the Q{n} paragraph; any further lines get their own
+        lines = _body_lines(q)
+        p.add_run(lines[0])
+        for line in lines[1:]:
+            sentinel.insert_paragraph_before(line)
+        sentinel.insert_paragraph_before("")
+
+    _remove_paragraph(sentinel)
+    buf = io.BytesIO()
+    doc.save(buf)
+    _write_file(output_path, buf)
 
-    doc.save(output_path)
 
+def build_docx_answerkey(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1,
+                         *, generated_at: str | None = None) -> None:
+    from docx import Document
+    from docx.shared import Pt
 
-def build_docx_answerkey(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1) -> None:
     doc = Document()
     sections = doc.sections
+    margin = _docx_margin()
     for sec in sections:
-        sec.top_margin = Inches(0.75)
-        sec.bottom_margin = Inches(0.75)
-        sec.left_margin = Inches(0.75)
-        sec.right_margin = Inches(0.75)
+        sec.top_margin = margin
+        sec.bottom_margin = margin
+        sec.left_margin = margin
+        sec.right_margin = margin
+    sentinel = doc.add_paragraph()
 
-    title = doc.add_paragraph()
+    title = sentinel.insert_paragraph_before()
     run = title.add_run(f"Energy Toss-Up Answer Key {title_suffix}".strip() or "Energy Toss-Up Answer Key")
     run.bold = True
     run.font.size = Pt(18)
-    doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    doc.add_paragraph("")
+    sentinel.insert_paragraph_before(f"Generated: {generated_at or _timestamp()}")
+    sentinel.insert_paragraph_before("")
 
     for idx, q in enumerate(selected, start=start_number):
-        p = doc.add_paragraph()
+        p = sentinel.insert_paragraph_before()
         run = p.add_run(f"Q{idx}: ")
         run.bold = True
         run.font.size = Pt(11)
-        p.add_run(q['answer'] or '[NOT FOUND]')
+        p.add_run(_ans(q))
 
-    doc.save(output_path)
+    _remove_paragraph(sentinel)
+    buf = io.BytesIO()
+    doc.save(buf)
+    _write_file(output_path, buf)
 
 
-def build_questions_pdf(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1) -> None:
+def build_questions_pdf(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1,
+                        *, generated_at: str | None = None) -> None:
     """Questions-only PDF (no answers)."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buf = io.BytesIO()
     doc = SimpleDocTemplate(
-        output_path,
+        buf,
         pagesize=letter,
         rightMargin=0.75 * inch,
         leftMargin=0.75 * inch,
         topMargin=0.75 * inch,
         bottomMargin=0.75 * inch,
     )
-    styles = getSampleStyleSheet()
+    styles, q_style, _ = _get_styles(big=True)
     title_style = styles['Heading1']
-    title_style.spaceAfter = 12
-    q_style = ParagraphStyle('Question', parent=styles['Normal'], fontSize=11, leading=15)
 
     story = []
-    now = datetime.now().strftime('%Y-%m-%d %H:%M')
+    now = generated_at or _timestamp()
     title_text = f"Energy Toss-Up Questions {title_suffix}".strip()
     story.append(Paragraph(title_text or "Energy Toss-Up Questions", title_style))
     story.append(Paragraph(f"Generated: {now}", styles['Italic']))
     story.append(Spacer(1, 0.2 * inch))
 
     for idx, q in enumerate(selected, start=start_number):
-        body_html = escape_html(q['body']).replace('\n', '<br/>')
-        q_para = Paragraph(f"Q{idx}: {body_html}", q_style)
+        q_para = Paragraph(f"Q{idx}: {_body_html(q)}", q_style)
         story.append(q_para)
         story.append(Spacer(1, 0.2 * inch))
 
     doc.build(story)
+    _write_file(output_path, buf)
 
 
-def build_answerkey_pdf(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1) -> None:
+def build_answerkey_pdf(output_path: str, selected: list[dict], title_suffix: str = "", start_number: int = 1,
+                        *, generated_at: str | None = None) -> None:
     """Answer key PDF listing Qn and Answer only."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buf = io.BytesIO()
     doc = SimpleDocTemplate(
-        output_path,
+        buf,
         pagesize=letter,
         rightMargin=0.75 * inch,
         leftMargin=0.75 * inch,
         topMargin=0.75 * inch,
         bottomMargin=0.75 * inch,
     )
-    styles = getSampleStyleSheet()
+    styles, _, a_style = _get_styles(big=True)
     title_style = styles['Heading1']
-    title_style.spaceAfter = 12
-    a_style = ParagraphStyle('Answer', parent=styles['Normal'], fontSize=11, leading=15)
 
     story = []
-    now = datetime.now().strftime('%Y-%m-%d %H:%M')
+    now = generated_at or _timestamp()
     title_text = f"Energy Toss-Up Answer Key {title_suffix}".strip()
     story.append(Paragraph(title_text or "Energy Toss-Up Answer Key", title_style))
     story.append(Paragraph(f"Generated: {now}", styles['Italic']))
     story.append(Spacer(1, 0.2 * inch))
 
     for idx, q in enumerate(selected, start=start_number):
-        ans_text = q['answer'] or "[NOT FOUND]"
-        a_para = Paragraph(f"Q{idx}: {escape_html(ans_text)}", a_style)
+        a_para = Paragraph(f"Q{idx}: {_ans_html(q)}", a_style)
         story.append(a_para)
         story.append(Spacer(1, 0.08 * inch))
 
     doc.build(story)
+    _write_file(output_path, buf)
 
 
 def escape_html(s: str) -> str:
-    return (
-        s.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-    )
+    # Most question text has no markup characters at all; the membership tests
+    # are cheaper than three replace() calls that find nothing
+    if '&' in s:
+        s = s.replace("&", "&amp;")
+    if '<' in s:
+        s = s.replace("<", "&lt;")
+    if '>' in s:
+        s = s.replace(">", "&gt;")
+    return s
+
+
+def _with_derived(q: dict) -> dict:
+    """Copy of q with the text every builder needs worked out once:
+    body lines and answer-or-placeholder for docx, Paragraph markup for PDF.
+    A copy, because the dicts from load_questions are shared with its cache.
+    """
+    body = q['body']
+    ans = q['answer'] or "[NOT FOUND]"
+    return {
+        **q,
+        '_body_lines': body.split('\n') if '\n' in body else (body,),
+        '_ans': ans,
+        '_body_html': escape_html(body).replace('\n', '<br/>'),
+        '_ans_html': escape_html(ans),
+    }
+
+
+# The accessors below fall back to computing on the fly for plain question dicts
+
+def _body_lines(q: dict):
+    lines = q.get('_body_lines')
+    if lines is None:
+        body = q['body']
+        lines = body.split('\n') if '\n' in body else (body,)
+    return lines
+
+
+def _ans(q: dict) -> str:
+    ans = q.get('_ans')
+    return ans if ans is not None else (q['answer'] or "[NOT FOUND]")
+
+
+def _body_html(q: dict) -> str:
+    html = q.get('_body_html')
+    return html if html is not None else escape_html(q['body']).replace('\n', '<br/>')
+
+
+def _ans_html(q: dict) -> str:
+    html = q.get('_ans_html')
+    return html if html is not None else escape_html(_ans(q))
+
+
+def _build_one(args, questions: list[dict], i: int, generated_at: str) -> list[str]:
+    """Build every output file for set #i and return their paths.
+    Top-level so multiprocessing can pickle it for the worker processes.
+    """
+    saved = []
+    # Derive a different seed per output when a base seed is provided
+    seed_i = None if args.seed is None else (args.seed + i * 9973)
+    subset = pick_unique_questions(questions, args.num, seed=seed_i)
+    # Derive each question's text once for every PDF/docx built from this set
+    subset = [_with_derived(q) for q in subset]
+    # Give each output a unique name and title suffix
+    suffix = f"#{i}"
+    # Compute starting number per output if user wants to continue numbering across PDFs
+    start_no = args.start_number if args.num_pdfs == 1 else (args.start_number + (i - 1) * args.num)
+
+    if args.mode == 'inline':
+        # Build inline format
+        if args.format in ('pdf', 'both'):
+            out_name = f"Energy_TossUps_Set_{i:02d}.pdf"
+            out_path = os.path.join(args.output_dir, out_name)
+            build_pdf(out_path, subset, title_suffix=suffix, start_number=start_no, generated_at=generated_at)
+            saved.append(out_path)
+        if args.format in ('docx', 'both'):
+            out_name = f"Energy_TossUps_Set_{i:02d}.docx"
+            out_path = os.path.join(args.output_dir, out_name)
+            build_docx_inline(out_path, subset, title_suffix=suffix, start_number=start_no, generated_at=generated_at)
+            saved.append(out_path)
+    else:
+        # Build split format
+        if args.format in ('pdf', 'both'):
+            q_name = f"Energy_TossUps_Set_{i:02d}_Questions.pdf"
+            a_name = f"Energy_TossUps_Set_{i:02d}_AnswerKey.pdf"
+            q_path = os.path.join(args.output_dir, q_name)
+            a_path = os.path.join(args.output_dir, a_name)
+            build_questions_pdf(q_path, subset, title_suffix=suffix, start_number=start_no, generated_at=generated_at)
+            build_answerkey_pdf(a_path, subset, title_suffix=suffix, start_number=start_no, generated_at=generated_at)
+            saved += [q_path, a_path]
+        if args.format in ('docx', 'both'):
+            q_name = f"Energy_TossUps_Set_{i:02d}_Questions.docx"
+            a_name = f"Energy_TossUps_Set_{i:02d}_AnswerKey.docx"
+            q_path = os.path.join(args.output_dir, q_name)
+            a_path = os.path.join(args.output_dir, a_name)
+            build_docx_questions(q_path, subset, title_suffix=suffix, start_number=start_no, generated_at=generated_at)
+            build_docx_answerkey(a_path, subset, title_suffix=suffix, start_number=start_no, generated_at=generated_at)
+            saved += [q_path, a_path]
+
+    return saved
 
 
 def main():
@@ -317,54 +535,25 @@ def main():
 
     os.makedirs(args.output_dir, exist_ok=True)
 
-    questions = load_questions(args.input)
+    questions = load_questions(args.input, keep_orig_number=False)
     if len(questions) == 0:
         raise SystemExit("No questions parsed from input file.")
     if args.num > len(questions):
         raise SystemExit(f"Requested {args.num} questions but only {len(questions)} available")
 
-    base_seed = args.seed
-    for i in range(1, args.num_pdfs + 1):
-        # Derive a different seed per output when a base seed is provided
-        seed_i = None if base_seed is None else (base_seed + i * 9973)
-        subset = pick_unique_questions(questions, args.num, seed=seed_i)
-        # Give each output a unique name and title suffix
-        suffix = f"#{i}"
-        # Compute starting number per output if user wants to continue numbering across PDFs
-        start_no = args.start_number if args.num_pdfs == 1 else (args.start_number + (i - 1) * args.num)
-
-        if args.mode == 'inline':
-            # Build inline format
-            if args.format in ('pdf', 'both'):
-                out_name = f"Energy_TossUps_Set_{i:02d}.pdf"
-                out_path = os.path.join(args.output_dir, out_name)
-                build_pdf(out_path, subset, title_suffix=suffix, start_number=start_no)
-                print(f"Saved: {out_path}")
-            if args.format in ('docx', 'both'):
-                out_name = f"Energy_TossUps_Set_{i:02d}.docx"
-                out_path = os.path.join(args.output_dir, out_name)
-                build_docx_inline(out_path, subset, title_suffix=suffix, start_number=start_no)
-                print(f"Saved: {out_path}")
-        else:
-            # Build split format
-            if args.format in ('pdf', 'both'):
-                q_name = f"Energy_TossUps_Set_{i:02d}_Questions.pdf"
-                a_name = f"Energy_TossUps_Set_{i:02d}_AnswerKey.pdf"
-                q_path = os.path.join(args.output_dir, q_name)
-                a_path = os.path.join(args.output_dir, a_name)
-                build_questions_pdf(q_path, subset, title_suffix=suffix, start_number=start_no)
-                build_answerkey_pdf(a_path, subset, title_suffix=suffix, start_number=start_no)
-                print(f"Saved: {q_path}")
-                print(f"Saved: {a_path}")
-            if args.format in ('docx', 'both'):
-                q_name = f"Energy_TossUps_Set_{i:02d}_Questions.docx"
-                a_name = f"Energy_TossUps_Set_{i:02d}_AnswerKey.docx"
-                q_path = os.path.join(args.output_dir, q_name)
-                a_path = os.path.join(args.output_dir, a_name)
-                build_docx_questions(q_path, subset, title_suffix=suffix, start_number=start_no)
-                build_docx_answerkey(a_path, subset, title_suffix=suffix, start_number=start_no)
-                print(f"Saved: {q_path}")
-                print(f"Saved: {a_path}")
+    # One timestamp for the whole batch, so every file says the same thing
+    generated_at = _timestamp()
+    jobs = [(args, questions, i, generated_at) for i in range(1, args.num_pdfs + 1)]
+    # Each set is an independent CPU-bound build, so spread them across processes
+    workers = min(args.num_pdfs, os.cpu_count() or 1)
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.starmap(_build_one, jobs)
+    else:
+        results = [_build_one(*job) for job in jobs]
+    for paths in results:
+        for path in paths:
+            print(f"Saved: {path}")
 
 
 if __name__ == '__main__':
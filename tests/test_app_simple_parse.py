@@ -0,0 +1,89 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_simple import parse_quiz_text
+
+
+Q_STYLE = """\
+Q1: Which mineral primarily strengthens bone?
+A) Calcium
+B) Sodium
+C) Iron
+D) Zinc
+Answer: A
+
+Q2: Which planet is largest?
+A) Mars
+B) Jupiter
+C) Venus
+D) Earth
+Answer: B
+"""
+
+DOT_STYLE = """\
+1. Which mineral primarily strengthens bone?
+A) Calcium
+B) Sodium
+C) Iron
+D) Zinc
+Answer: A
+
+2. Which planet is largest?
+A) Mars
+B) Jupiter
+C) Venus
+D) Earth
+Answer: B
+"""
+
+
+def _summary(blocks):
+    return [(b["qnum"], b["stem"], b["answer"]) for b in blocks]
+
+
+def test_q_colon_style():
+    blocks = parse_quiz_text(Q_STYLE)
+    assert _summary(blocks) == [
+        (1, "Which mineral primarily strengthens bone?", "A"),
+        (2, "Which planet is largest?", "B"),
+    ]
+    assert blocks[1]["options"] == {"A": "Mars", "B": "Jupiter", "C": "Venus", "D": "Earth"}
+
+
+def test_numbered_dot_style():
+    assert _summary(parse_quiz_text(DOT_STYLE)) == _summary(parse_quiz_text(Q_STYLE))
+
+
+def test_numbered_list_in_stem_stays_in_stem():
+    text = (
+        "Q1: Which are noble gases?\n"
+        "1. Helium\n"
+        "2. Neon\n"
+        "3. Nitrogen\n"
+        "A) 1 and 2\nB) 2 and 3\nC) 1 only\nD) All three\n"
+        "Answer: A\n"
+    )
+    assert _summary(parse_quiz_text(text)) == [
+        (1, "Which are noble gases? 1. Helium 2. Neon 3. Nitrogen", "A"),
+    ]
+
+
+def test_numeric_continuation_lines():
+    text = (
+        "1. Compute\n"
+        "2.5 + 3 = ?\n"
+        "A) 5.5\n"
+        "1990: the year\n"
+        "B) 6\nC) 7\nD) 8\n"
+        "Answer: A\n"
+    )
+    blocks = parse_quiz_text(text)
+    assert _summary(blocks) == [(1, "Compute 2.5 + 3 = ?", "A")]
+    assert blocks[0]["options"]["A"] == "5.5 1990: the year"
+
+
+def test_dedupe_and_no_questions():
+    assert len(parse_quiz_text(Q_STYLE + Q_STYLE.replace("Q1", "Q3").replace("Q2", "Q4"))) == 2
+    assert parse_quiz_text("no questions here\nAnswer: A\n") == []